@@ -2,6 +2,14 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from change_feed import ChangeFeed
+from rollup_cube import DIMENSIONS, GRAINS, PeriodCloseSync, RollupCube, generate_sample_transactions
+
+@st.cache_resource
+def load_revenue_cube():
+    cube = RollupCube()
+    cube.refresh(generate_sample_transactions())
+    return PeriodCloseSync(cube, ChangeFeed())
 
 def exec_management_page():
     st.title("Executive Management Dashboard")
@@ -22,13 +30,22 @@ def exec_management_page():
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        # Revenue trend
-        chart_data = pd.DataFrame({
-            'Month': pd.date_range(start='2024-01-01', periods=12, freq='M'),
-            'Revenue': [12.1, 12.3, 12.8, 13.2, 13.5, 13.8, 14.1, 14.3, 14.6, 14.9, 15.1, 15.2],
-            'Target': [12.0, 12.5, 13.0, 13.5, 14.0, 14.5, 15.0, 15.5, 16.0, 16.5, 17.0, 17.5]
-        })
-        fig = px.line(chart_data, x='Month', y=['Revenue', 'Target'], title='Revenue vs Target')
+        # Revenue trend, read from the pre-aggregated cube
+        grain_col, drill_col = st.columns(2)
+        with grain_col:
+            grain = st.selectbox("Period", options=list(GRAINS))
+        with drill_col:
+            drill_down = st.selectbox("Drill Down By", options=["None"] + DIMENSIONS)
+        by = [] if drill_down == "None" else [drill_down]
+        chart_data = load_revenue_cube().sync().slice(grain, by=by)
+        chart_data[['Revenue', 'Target']] = chart_data[['Revenue', 'Target']] / 1e6
+        if by:
+            fig = px.line(chart_data, x='Period', y='Revenue', color=drill_down,
+                          hover_data=['Target', 'Margin %'], title=f'Revenue by {drill_down} ($M)',
+                          markers=True)
+        else:
+            fig = px.line(chart_data, x='Period', y=['Revenue', 'Target'], title='Revenue vs Target ($M)',
+                          markers=True)
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
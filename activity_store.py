@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+ACTIVITY_COLUMNS = ['Activity ID', 'Activity', 'Department', 'Owner', 'Start', 'End', 'Status']
+OPEN_STATUSES = ['Scheduled', 'In Progress', 'Upcoming']
+
+class _DepartmentIndex:
+    # Intervals are bucketed into tiers of similar length (durations up to 2**k seconds).
+    # Within a tier, anything overlapping [lo, hi] must start in [lo - longest, hi], so each
+    # tier is a sorted-start binary search plus a short scan instead of a full pass.
+    def __init__(self, activities):
+        self.activities = activities.reset_index(drop=True)
+        starts = self.activities['Start'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        ends = self.activities['End'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        durations = np.maximum(ends - starts, 1)
+        levels = np.ceil(np.log2(np.maximum(durations // 10**9, 1))).astype(int)
+
+        self.tiers = []
+        for level in np.unique(levels):
+            rows = np.flatnonzero(levels == level)
+            rows = rows[np.argsort(starts[rows], kind='stable')]
+            self.tiers.append((starts[rows], ends[rows], rows, durations[rows].max()))
+
+        open_rows = np.flatnonzero(self.activities['Status'].isin(OPEN_STATUSES).to_numpy())
+        self.open_rows = open_rows[np.argsort(ends[open_rows], kind='stable')]
+        self.open_ends = ends[self.open_rows]
+
+    def overlapping(self, lo, hi):
+        matches = []
+        for starts, ends, rows, longest in self.tiers:
+            left = np.searchsorted(starts, lo - longest, side='left')
+            right = np.searchsorted(starts, hi, side='right')
+            matches.append(rows[left:right][ends[left:right] >= lo])
+        return np.concatenate(matches) if matches else np.empty(0, dtype=int)
+
+    def due(self, lo, hi):
+        left = np.searchsorted(self.open_ends, lo, side='left')
+        right = np.searchsorted(self.open_ends, hi, side='left')
+        return self.open_rows[left:right]
+
+class ActivityStore:
+    def __init__(self, activities=None):
+        self.departments = {}
+        if activities is not None:
+            self.add(activities)
+
+    def add(self, activities):
+        # Re-index only the departments that received new or updated activities
+        activities = activities[ACTIVITY_COLUMNS]
+        for department, new_activities in activities.groupby('Department'):
+            if department in self.departments:
+                new_activities = pd.concat([self.departments[department].activities, new_activities])
+            new_activities = new_activities.drop_duplicates('Activity ID', keep='last')
+            self.departments[department] = _DepartmentIndex(new_activities)
+
+    def query(self, start, end, departments=None, as_of=None):
+        # Activities overlapping [start, end]; open ones that ended in the range before as_of are overdue
+        as_of = _to_ns(as_of or datetime.now())
+        lo, hi = _to_ns(start), _to_ns(end)
+        frames = []
+        for index in self._indexes(departments):
+            rows = np.sort(index.overlapping(lo, hi))
+            overdue = index.due(lo, min(hi + 1, as_of))
+            frames.append(index.activities.iloc[rows].assign(Overdue=np.isin(rows, overdue)))
+        return self._combine(frames, ACTIVITY_COLUMNS + ['Overdue'])
+
+    def due(self, start=None, end=None, departments=None):
+        # Open activities whose end falls in [start, end)
+        lo = np.iinfo(np.int64).min if start is None else _to_ns(start)
+        hi = np.iinfo(np.int64).max if end is None else _to_ns(end)
+        frames = [index.activities.iloc[index.due(lo, hi)] for index in self._indexes(departments)]
+        return self._combine(frames, ACTIVITY_COLUMNS)
+
+    def count_due(self, start=None, end=None, departments=None):
+        lo = np.iinfo(np.int64).min if start is None else _to_ns(start)
+        hi = np.iinfo(np.int64).max if end is None else _to_ns(end)
+        return sum(len(index.due(lo, hi)) for index in self._indexes(departments))
+
+    def _indexes(self, departments):
+        if not departments:
+            return list(self.departments.values())
+        return [self.departments[d] for d in departments if d in self.departments]
+
+    def _combine(self, frames, columns):
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True).sort_values('Start', ignore_index=True)
+
+def _to_ns(value):
+    return pd.Timestamp(value).value
+
+def generate_sample_activities(num_activities=100000, departments=None):
+    departments = departments or ['Sales', 'Marketing', 'Finance', 'Operations', 'IT']
+    now = datetime.now()
+    starts = pd.Timestamp(now - timedelta(days=180)) + pd.to_timedelta(
+        np.random.randint(0, 360 * 24, num_activities), unit='h'
+    )
+    durations = pd.to_timedelta(np.random.choice([1, 2, 8, 24, 72, 168, 720], num_activities), unit='h')
+    ends = starts + durations
+    statuses = np.where(
+        ends < pd.Timestamp(now),
+        np.random.choice(['Completed', 'In Progress'], num_activities, p=[0.97, 0.03]),
+        np.random.choice(['Scheduled', 'In Progress', 'Upcoming'], num_activities)
+    )
+    return pd.DataFrame({
+        'Activity ID': [f'ACT-{i:07d}' for i in range(num_activities)],
+        'Activity': np.random.choice(
+            ['Team Meeting', 'Project Launch', 'Deadline', 'Customer Call', 'Expense Report', 'Purchase Request'],
+            num_activities
+        ),
+        'Department': np.random.choice(departments, num_activities),
+        'Owner': np.random.choice(['John D.', 'Sarah M.', 'Mike R.'], num_activities),
+        'Start': starts,
+        'End': ends,
+        'Status': statuses
+    })
@@ -1,9 +1,104 @@
+import logging
+import threading
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
+from change_feed import ChangeFeed
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_COLUMNS = ['Document Name', 'Type', 'Created Date', 'Status', 'Owner']
+
+@st.cache_resource
+def load_live_state():
+    app = DashboardApp()
+    return LiveFeedState(
+        ChangeFeed(),
+        app.generate_analytics_data()['kpis'],
+        app.generate_documents_data()['document_list']
+    )
+
+class LiveFeedState:
+    # One per process, shared by every session: a single cursor over the change feed and the
+    # KPI and document state folded from it. The whole durable log is replayed on startup, so
+    # every session sees the same tables no matter when it opened.
+    TOPICS = ['kpi', 'document']
+
+    def __init__(self, feed, kpis, documents):
+        self.feed = feed
+        self.cursor = 0
+        self.kpis = dict(kpis)
+        self.documents = documents[DOCUMENT_COLUMNS]
+        self.document_updates = {}
+        self.lock = threading.Lock()
+
+    def sync(self):
+        with self.lock:
+            while True:
+                changes = self.feed.read_since(self.cursor, self.TOPICS)
+                if not changes:
+                    break
+                for change in changes:
+                    if change['topic'] == 'kpi':
+                        self.apply_kpi_change(change)
+                    else:
+                        self.apply_document_change(change)
+                self.cursor = changes[-1]['seq']
+            return dict(self.kpis), self.document_list()
+
+    def apply_kpi_change(self, change):
+        kpi = self.parse_kpi_change(change)
+        if kpi is None:
+            logger.warning("Skipping malformed kpi change %s: %r", change['seq'], change['payload'])
+            return
+        self.kpis[kpi['name']] = {'current': kpi['current'], 'delta': kpi['delta']}
+
+    def apply_document_change(self, change):
+        document = self.parse_document_change(change)
+        if document is None:
+            logger.warning("Skipping malformed document change %s: %r", change['seq'], change['payload'])
+            return
+        self.document_updates[document['Document Name']] = document
+
+    def document_list(self):
+        if not self.document_updates:
+            return self.documents
+        updates = pd.DataFrame(list(self.document_updates.values()), columns=DOCUMENT_COLUMNS)
+        updates['Created Date'] = pd.to_datetime(updates['Created Date'])
+        documents = self.documents[~self.documents['Document Name'].isin(updates['Document Name'])]
+        return pd.concat([documents, updates], ignore_index=True)
+
+    def parse_kpi_change(self, change):
+        kpi = change['payload']
+        if not isinstance(kpi, dict) or not isinstance(kpi.get('name'), str):
+            return None
+        scalar = (str, int, float)
+        if not isinstance(kpi.get('current'), scalar) or not isinstance(kpi.get('delta'), scalar + (type(None),)):
+            return None
+        return {'name': kpi['name'], 'current': kpi['current'], 'delta': kpi.get('delta')}
+
+    def parse_document_change(self, change):
+        # Bad rows are dropped here so they never reach the shared state and re-fail on every sync
+        document = change['payload']
+        if not isinstance(document, dict) or not isinstance(document.get('Document Name'), str):
+            return None
+        try:
+            created = pd.to_datetime(document.get('Created Date', change['posted_at']), format='ISO8601')
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(created, pd.Timestamp) or pd.isna(created):
+            return None
+        if created.tzinfo is not None:
+            created = created.tz_convert(None)
+        document = {
+            column: value if isinstance(value, (str, int, float)) else None
+            for column, value in ((column, document.get(column)) for column in DOCUMENT_COLUMNS)
+        }
+        document['Created Date'] = created
+        return document
 
 class DashboardData:
     def generate_activities_data(self):
@@ -84,6 +179,8 @@ class DashboardLayouts:
         st.write("Configure application settings and preferences.")
 
 class DashboardApp:
+    REFRESH_INTERVAL = "5s"
+
     def __init__(self):
         self.data = DashboardData()
         self.layouts = DashboardLayouts()
@@ -112,9 +209,9 @@ class DashboardApp:
         with tabs[6]:
             self.layouts.render_reports_tab(self.generate_reports_data())
         with tabs[7]:
-            self.layouts.render_analytics_tab(self.generate_analytics_data())
+            self.render_live(self.render_analytics_live, self.generate_analytics_data())
         with tabs[8]:
-            self.layouts.render_documents_tab(self.generate_documents_data())
+            self.render_live(self.render_documents_live)
         with tabs[9]:
             self.layouts.render_setup_tab()
 
@@ -133,9 +230,23 @@ class DashboardApp:
                 "Department",
                 options=["Sales", "Marketing", "Finance", "Operations", "IT"]
             )
+            st.toggle("Live Updates", value=True, key="live_updates")
             if st.button("Refresh Data"):
                 st.rerun()
 
+    def render_live(self, render, *args):
+        # Only the fragment reruns on each tick, the rest of the page is left untouched
+        run_every = self.REFRESH_INTERVAL if st.session_state.get("live_updates", True) else None
+        st.fragment(render, run_every=run_every)(*args)
+
+    def render_analytics_live(self, data):
+        kpis, _ = load_live_state().sync()
+        self.layouts.render_analytics_tab({**data, 'kpis': kpis})
+
+    def render_documents_live(self):
+        _, documents = load_live_state().sync()
+        self.layouts.render_documents_tab(self.summarize_documents(documents))
+
     def generate_reports_data(self):
         reports = {
             'Financial Reports': pd.DataFrame({
@@ -172,6 +283,9 @@ class DashboardApp:
             'Status': np.random.choice(['Draft', 'Under Review', 'Approved'], num_docs),
             'Owner': np.random.choice(['John D.', 'Sarah M.', 'Mike R.'], num_docs)
         })
+        return self.summarize_documents(documents)
+
+    def summarize_documents(self, documents):
         return {
             'total_documents': len(documents),
             'recent_uploads': len(documents[documents['Created Date'].dt.date == datetime.now().date()]),
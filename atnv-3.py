@@ -1,16 +1,102 @@
+import logging
+import math
+import threading
 import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from change_feed import ChangeFeed
+from three_way_match import (
+    BILL_COLUMNS, EXCEPTION_STATUSES, PO_COLUMNS, RECEIPT_COLUMNS, ThreeWayMatcher, generate_sample_documents
+)
+from activity_store import OPEN_STATUSES, ActivityStore, generate_sample_activities
+
+logger = logging.getLogger(__name__)
+
+DEPARTMENTS = ['Sales', 'Marketing', 'Finance', 'Operations', 'IT']
+VENDOR_NAMES = [f'Vendor {i}' for i in range(1, 6)]
+
+# Change feed topic -> (ThreeWayMatcher.add_documents argument, required payload fields)
+PROCUREMENT_TOPICS = {
+    'purchase_order': ('purchase_orders', PO_COLUMNS),
+    'goods_receipt': ('receipts', RECEIPT_COLUMNS),
+    'vendor_bill': ('bills', BILL_COLUMNS),
+}
+
+@st.cache_resource
+def load_activity_store():
+    return ActivityStore(generate_sample_activities(departments=DEPARTMENTS))
+
+@st.cache_resource
+def load_vendor_matching():
+    return VendorMatching(ChangeFeed(), generate_sample_documents(VENDOR_NAMES))
+
+class VendorMatching:
+    # One matcher per process; documents posted to the change feed after startup are folded
+    # in through ThreeWayMatcher.add_documents rather than re-matching everything.
+    def __init__(self, feed, documents):
+        self.feed = feed
+        self.matcher = ThreeWayMatcher()
+        self.matcher.match(*documents)
+        self.cursor = feed.latest_seq()
+        self.lock = threading.Lock()
+
+    def sync(self):
+        with self.lock:
+            while True:
+                changes = self.feed.read_since(self.cursor, list(PROCUREMENT_TOPICS))
+                if not changes:
+                    return self.matcher
+                documents = {argument: [] for argument, _ in PROCUREMENT_TOPICS.values()}
+                for change in changes:
+                    argument, columns = PROCUREMENT_TOPICS[change['topic']]
+                    payload = change['payload']
+                    if not self.valid_document(payload, columns):
+                        logger.warning("Skipping malformed %s change %s: %r", change['topic'], change['seq'], payload)
+                        continue
+                    documents[argument].append({column: payload[column] for column in columns})
+                self.apply_documents(documents)
+                # The cursor moves past the page even if some of it failed, so one bad row can't wedge the page
+                self.cursor = changes[-1]['seq']
+
+    def apply_documents(self, documents):
+        try:
+            self.matcher.add_documents(**{
+                argument: pd.DataFrame(rows) for argument, rows in documents.items() if rows
+            })
+        except Exception:
+            logger.exception("Failed to apply procurement batch, retrying documents one at a time")
+            for argument, rows in documents.items():
+                for row in rows:
+                    try:
+                        self.matcher.add_documents(**{argument: pd.DataFrame([row])})
+                    except Exception:
+                        logger.exception("Skipping procurement document %r", row)
+
+    def valid_document(self, payload, columns):
+        if not isinstance(payload, dict) or any(column not in payload for column in columns):
+            return False
+        if not isinstance(payload['PO Number'], str) or not _is_int(payload['Line']):
+            return False
+        if 'Vendor Name' in columns and not isinstance(payload['Vendor Name'], str):
+            return False
+        amounts = [column for column in columns if column not in ('PO Number', 'Line', 'Vendor Name')]
+        return all(_is_number(payload[column]) for column in amounts)
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
 
 class DashboardData:
-    def generate_activities_data(self):
-        activities = pd.DataFrame({
-            'Activity': ['Team Meeting', 'Project Launch', 'Deadline'],
-            'Date': [datetime.now() - timedelta(days=i) for i in range(3)],
-            'Status': ['Completed', 'Scheduled', 'Upcoming']
-        })
-        return {'activities': activities}
+    def generate_activities_data(self, start, end, departments=None):
+        activities = load_activity_store().query(start, end, departments)
+        return {
+            'activities': activities,
+            'active': int((activities['Status'].isin(OPEN_STATUSES) & ~activities['Overdue']).sum()),
+            'overdue': int(activities['Overdue'].sum())
+        }
 
     def generate_billing_data(self):
         billing = pd.DataFrame({
@@ -32,12 +118,15 @@ class DashboardData:
 
     def generate_vendors_data(self):
         vendors = pd.DataFrame({
-            'Vendor Name': [f'Vendor {i}' for i in range(1, 6)],
+            'Vendor Name': VENDOR_NAMES,
             'Contact': [f'contact{i}@vendor.com' for i in range(1, 6)],
-            'Pending Orders': np.random.randint(1, 10, 5),
             'Last Order': [datetime.now() - timedelta(days=i * 7) for i in range(5)]
         })
-        return {'vendors': vendors}
+        matcher = load_vendor_matching().sync()
+        vendors = vendors.merge(matcher.vendor_exceptions(), on='Vendor Name', how='left')
+        vendors[['Open Lines', 'Match Exceptions']] = vendors[['Open Lines', 'Match Exceptions']].fillna(0).astype(int)
+        exceptions = matcher.results[matcher.results['Status'].isin(EXCEPTION_STATUSES)]
+        return {'vendors': vendors, 'exceptions': exceptions}
 
     def generate_payroll_data(self):
         payroll = pd.DataFrame({
@@ -145,10 +234,29 @@ class DashboardApp:
             self.render_setup_page()
 
     def render_activities_page(self):
-        data = self.data.generate_activities_data()
         st.title("Activities Dashboard")
         st.write("Here you can track ongoing activities.")
-        st.table(data['activities'])
+        col1, col2 = st.columns(2)
+        with col1:
+            date_range = st.date_input(
+                "Date Range",
+                value=(datetime.now() - timedelta(days=7), datetime.now() + timedelta(days=7))
+            )
+        with col2:
+            departments = st.multiselect("Department", options=DEPARTMENTS)
+        start, end = (date_range[0], date_range[-1]) if date_range else (datetime.now(), datetime.now())
+        data = self.data.generate_activities_data(
+            datetime.combine(start, datetime.min.time()),
+            datetime.combine(end, datetime.max.time()),
+            departments
+        )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Active in Range", f"{data['active']:,}")
+        with col2:
+            st.metric("Overdue", f"{data['overdue']:,}")
+        st.dataframe(data['activities'], hide_index=True, use_container_width=True)
 
     def render_billing_page(self):
         data = self.data.generate_billing_data()
@@ -167,6 +275,8 @@ class DashboardApp:
         st.title("Vendor Dashboard")
         st.write("Monitor and manage vendor relationships.")
         st.table(data['vendors'])
+        st.subheader("Three-Way Match Exceptions")
+        st.dataframe(data['exceptions'], hide_index=True, use_container_width=True)
 
     def render_payroll_page(self):
         data = self.data.generate_payroll_data()
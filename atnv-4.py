@@ -4,6 +4,9 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
+from activity_store import ActivityStore, generate_sample_activities
+from change_feed import ChangeFeed
+from rollup_cube import DIMENSIONS, GRAINS, PeriodCloseSync, RollupCube, generate_sample_transactions
 
 # Configuration and Page Setup
 st.set_page_config(page_title="NetSuite Dashboard Clone", layout="wide", initial_sidebar_state="expanded")
@@ -76,9 +79,24 @@ budget_vs_actual_data = pd.DataFrame({
     'Variance %': ['+5.2%', '-3.4%', '+10.7%']
 })
 
+@st.cache_resource
+def load_activity_store():
+    return ActivityStore(generate_sample_activities())
+
+@st.cache_resource
+def load_revenue_cube():
+    cube = RollupCube()
+    cube.refresh(generate_sample_transactions(monthly_revenue=3.2e6, revenue_growth=0.015))
+    return PeriodCloseSync(cube, ChangeFeed())
+
+activity_store = load_activity_store()
+now = datetime.now()
+
 # Sidebar
 with st.sidebar:
     st.header("Reminders")
+    st.warning(f"⏰ {activity_store.count_due(end=now):,} Overdue Activities")
+    st.info(f"📅 {activity_store.count_due(now, now + timedelta(days=7)):,} Activities Due This Week")
     st.info("📋 Expense Reports to Approve")
     st.info("📝 Purchase Request to Approve")
     st.warning("⚠️ Invoice > 30 Days > 50K")
@@ -113,16 +131,21 @@ def show_dashboard():
         st.metric("Receivables", kpi_data["Receivables"]["value"], kpi_data["Receivables"]["change"])
 
     # Revenue Trend Chart
-    dates = pd.date_range(start='2024-01-01', end='2024-12-31', freq='M')
-    revenue_data = pd.DataFrame({
-        'Date': dates,
-        'Revenue': [3.2, 3.4, 3.7, 3.5, 3.8, 3.6, 3.9, 3.7, 3.8, 4.0, 3.9, 3.7],
-    })
-    
     st.subheader("Revenue by Period Trend")
-    fig = px.line(revenue_data, x='Date', y='Revenue',
-                  labels={'Revenue': 'Revenue (Millions $)', 'Date': 'Period'},
-                  line_shape='spline')
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        grain = st.selectbox("Period", options=list(GRAINS))
+    with col2:
+        drill_down = st.selectbox("Drill Down By", options=["None"] + DIMENSIONS)
+    with col3:
+        departments = st.multiselect("Department", options=["Sales", "Marketing", "Finance", "Operations", "IT"])
+    by = [] if drill_down == "None" else [drill_down]
+    revenue_data = load_revenue_cube().sync().slice(grain, by=by, Department=departments)
+    revenue_data['Revenue'] = revenue_data['Revenue'] / 1e6
+
+    fig = px.line(revenue_data, x='Period', y='Revenue', color=by[0] if by else None,
+                  labels={'Revenue': 'Revenue (Millions $)'},
+                  line_shape='spline', markers=True)
     fig.update_layout(height=400, margin=dict(l=20, r=20, t=20, b=20))
     st.plotly_chart(fig, use_container_width=True)
 
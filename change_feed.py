@@ -0,0 +1,62 @@
+import json
+import os
+import sqlite3
+import sys
+from contextlib import closing
+from datetime import datetime
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "change_feed.db")
+
+class ChangeFeed:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    topic TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    posted_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_changes_topic_seq ON changes (topic, seq)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def append(self, topic, payload):
+        # Writers only ever append and readers track their own cursor. SQLite still locks the
+        # database for each insert; concurrent writers wait up to the connection timeout.
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO changes (topic, payload, posted_at) VALUES (?, ?, ?)",
+                (topic, json.dumps(payload, default=str), datetime.now().isoformat())
+            )
+            return cursor.lastrowid
+
+    def latest_seq(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def read_since(self, seq, topics=None, limit=1000):
+        query = "SELECT seq, topic, payload, posted_at FROM changes WHERE seq > ?"
+        params = [seq]
+        if topics:
+            query += f" AND topic IN ({', '.join('?' * len(topics))})"
+            params.extend(topics)
+        query += " ORDER BY seq LIMIT ?"
+        params.append(limit)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [
+            {'seq': seq, 'topic': topic, 'payload': json.loads(payload), 'posted_at': posted_at}
+            for seq, topic, payload, posted_at in rows
+        ]
+
+if __name__ == "__main__":
+    # Post a change from the command line, e.g.
+    # python change_feed.py kpi '{"name": "Revenue Growth", "current": "15.9%", "delta": "0.7%"}'
+    if len(sys.argv) != 3:
+        sys.exit("usage: python change_feed.py <topic> <json-payload>")
+    feed = ChangeFeed()
+    print(feed.append(sys.argv[1], json.loads(sys.argv[2])))
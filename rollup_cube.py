@@ -0,0 +1,142 @@
+import logging
+import math
+import threading
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+GRAINS = {'Month': 'M', 'Quarter': 'Q', 'Year': 'Y'}
+DIMENSIONS = ['Department', 'Company', 'Product']
+MEASURES = ['Revenue', 'Target', 'Margin']
+PERIOD_CLOSE_TOPIC = 'period_close'
+
+class RollupCube:
+    # Every grain x dimension subset is kept as its own aggregate table (24 in all), so
+    # drilling or re-slicing picks the matching table instead of grouping raw transactions.
+    def __init__(self):
+        self.months = pd.DataFrame(columns=MEASURES, dtype=float)
+        self.cuboids = {
+            (grain, dims): pd.DataFrame(columns=MEASURES, dtype=float)
+            for grain in GRAINS
+            for size in range(len(DIMENSIONS) + 1)
+            for dims in combinations(DIMENSIONS, size)
+        }
+
+    @property
+    def loaded_periods(self):
+        if self.months.empty:
+            return []
+        return sorted(self.months.index.get_level_values('Period').unique())
+
+    def refresh(self, transactions):
+        # transactions hold the complete activity of every month they touch. Those months replace
+        # whatever was loaded for them before, so re-running a close or posting a correction never
+        # double counts; only the quarters and years containing them are rebuilt in each cuboid.
+        months = transactions.assign(Period=transactions['Date'].dt.to_period('M'))
+        loaded = months.groupby(['Period'] + DIMENSIONS)[MEASURES].sum()
+        refreshed = loaded.index.get_level_values('Period').unique()
+        if not self.months.empty:
+            kept = self.months[~self.months.index.get_level_values('Period').isin(refreshed)]
+            loaded = pd.concat([kept, loaded]).sort_index()
+        self.months = loaded
+
+        period_months = self.months.index.get_level_values('Period')
+        for (grain, dims), cuboid in self.cuboids.items():
+            affected = refreshed.asfreq(GRAINS[grain]).unique()
+            rollup = self.months[period_months.asfreq(GRAINS[grain]).isin(affected)].reset_index()
+            rollup['Period'] = rollup['Period'].dt.asfreq(GRAINS[grain]).dt.start_time
+            rollup = rollup.groupby(['Period'] + list(dims))[MEASURES].sum()
+            if not cuboid.empty:
+                kept = cuboid[~cuboid.index.get_level_values('Period').isin(affected.start_time)]
+                rollup = pd.concat([kept, rollup]).sort_index()
+            self.cuboids[(grain, dims)] = rollup
+
+    def slice(self, grain='Month', by=None, **filters):
+        # filters map a dimension to the values to keep, e.g. Department=['Sales', 'IT']
+        by = [dim for dim in DIMENSIONS if dim in (by or [])]
+        filters = {dim: values for dim, values in filters.items() if values}
+        dims = tuple(dim for dim in DIMENSIONS if dim in by or dim in filters)
+        cuboid = self.cuboids[(grain, dims)]
+        if cuboid.empty:
+            return pd.DataFrame(columns=['Period'] + by + MEASURES + ['Margin %'])
+        mask = np.ones(len(cuboid), dtype=bool)
+        for dim, values in filters.items():
+            mask &= cuboid.index.get_level_values(dim).isin(values)
+        result = cuboid[mask]
+        if len(dims) > len(by):
+            result = result.groupby(['Period'] + by)[MEASURES].sum()
+        result = result.reset_index()
+        result['Margin %'] = (result['Margin'] / result['Revenue'] * 100).round(1)
+        return result
+
+class PeriodCloseSync:
+    # Keeps a cube current from period_close changes on a change feed. Each change carries the
+    # complete transactions of the months it closes, so replaying the whole log is safe:
+    # refresh() replaces those months instead of adding to them.
+    def __init__(self, cube, feed):
+        self.cube = cube
+        self.feed = feed
+        self.cursor = 0
+        self.lock = threading.Lock()
+
+    def sync(self):
+        with self.lock:
+            while True:
+                changes = self.feed.read_since(self.cursor, [PERIOD_CLOSE_TOPIC])
+                if not changes:
+                    return self.cube
+                for change in changes:
+                    transactions = self.parse_period_close(change)
+                    if transactions is None:
+                        logger.warning("Skipping malformed period close %s", change['seq'])
+                        continue
+                    try:
+                        self.cube.refresh(transactions)
+                    except Exception:
+                        logger.exception("Failed to apply period close %s", change['seq'])
+                self.cursor = changes[-1]['seq']
+
+    def parse_period_close(self, change):
+        # A close replaces whole months, so one bad row rejects the change rather than dropping the row
+        payload = change['payload']
+        rows = payload.get('transactions') if isinstance(payload, dict) else None
+        if not isinstance(rows, list) or not rows:
+            return None
+        for row in rows:
+            if not isinstance(row, dict):
+                return None
+            if any(not isinstance(row.get(column), str) for column in ['Date'] + DIMENSIONS):
+                return None
+            if any(not _is_number(row.get(measure)) for measure in MEASURES):
+                return None
+        transactions = pd.DataFrame(rows, columns=['Date'] + DIMENSIONS + MEASURES)
+        try:
+            dates = pd.to_datetime(transactions['Date'], format='ISO8601', utc=True)
+        except (TypeError, ValueError):
+            return None
+        transactions['Date'] = dates.dt.tz_convert(None)
+        return transactions
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+def generate_sample_transactions(start='2024-01-01', months=12, monthly_revenue=12e6,
+                                 revenue_growth=0.02, target_growth=0.035):
+    dates = pd.date_range(start=start, periods=months, freq='MS')
+    days = pd.date_range(start=dates[0], end=dates[-1] + pd.offsets.MonthEnd(0), freq='D')
+    transactions = pd.MultiIndex.from_product(
+        [days, ['Sales', 'Marketing', 'Finance', 'Operations', 'IT'],
+         [f'Company {i}' for i in range(1, 6)], ['Software', 'Services', 'Hardware', 'Support']],
+        names=['Date'] + DIMENSIONS
+    ).to_frame(index=False)
+
+    month_number = (transactions['Date'].dt.year - dates[0].year) * 12 + transactions['Date'].dt.month - dates[0].month
+    rows_per_month = transactions.groupby(transactions['Date'].dt.to_period('M'))['Date'].transform('size')
+    revenue = monthly_revenue * (1 + revenue_growth) ** month_number / rows_per_month
+    transactions['Revenue'] = revenue * np.random.uniform(0.5, 1.5, len(transactions))
+    transactions['Target'] = monthly_revenue * (1 + target_growth) ** month_number / rows_per_month
+    transactions['Margin'] = transactions['Revenue'] * np.random.uniform(0.55, 0.75, len(transactions))
+    return transactions
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from activity_store import OPEN_STATUSES, ActivityStore, generate_sample_activities
+
+NOW = datetime(2026, 6, 15, 12, 0)
+
+
+@pytest.fixture(scope="module")
+def activities():
+    np.random.seed(0)
+    return generate_sample_activities(20000)
+
+
+@pytest.fixture(scope="module")
+def store(activities):
+    return ActivityStore(activities)
+
+
+def brute_force(activities, start, end, departments, as_of):
+    rows = activities[(activities['Start'] <= end) & (activities['End'] >= start)]
+    if departments:
+        rows = rows[rows['Department'].isin(departments)]
+    overdue = rows['Status'].isin(OPEN_STATUSES) & (rows['End'] <= end) & (rows['End'] < as_of)
+    return set(rows['Activity ID']), set(rows.loc[overdue, 'Activity ID'])
+
+
+@pytest.mark.parametrize("offset_days, span_days, departments", [
+    (-7, 14, None),
+    (-30, 10, ['Sales', 'IT']),
+    (3, 6, ['Finance']),
+    (-200, 1, None),
+    (0, 0, ['Marketing']),
+])
+def test_query_matches_brute_force(activities, store, offset_days, span_days, departments):
+    now = datetime.now()
+    start = now + timedelta(days=offset_days)
+    end = start + timedelta(days=span_days)
+    result = store.query(start, end, departments, as_of=now)
+
+    expected_ids, expected_overdue = brute_force(activities, start, end, departments, now)
+    assert set(result['Activity ID']) == expected_ids
+    assert set(result.loc[result['Overdue'], 'Activity ID']) == expected_overdue
+    assert result['Start'].is_monotonic_increasing
+
+
+def test_due_and_count_due(activities, store):
+    now = datetime.now()
+    week = now + timedelta(days=7)
+    open_rows = activities[activities['Status'].isin(OPEN_STATUSES)]
+    due_this_week = open_rows[(open_rows['End'] >= now) & (open_rows['End'] < week)]
+
+    assert set(store.due(now, week)['Activity ID']) == set(due_this_week['Activity ID'])
+    assert store.count_due(now, week) == len(due_this_week)
+    assert store.count_due(end=now) == (open_rows['End'] < now).sum()
+
+
+def test_add_replaces_activity_by_id():
+    activities = pd.DataFrame({
+        'Activity ID': ['ACT-1', 'ACT-2'],
+        'Activity': ['Deadline', 'Team Meeting'],
+        'Department': ['Sales', 'IT'],
+        'Owner': ['John D.', 'Sarah M.'],
+        'Start': [NOW - timedelta(days=3), NOW - timedelta(days=1)],
+        'End': [NOW - timedelta(days=2), NOW + timedelta(days=1)],
+        'Status': ['In Progress', 'Scheduled'],
+    })
+    store = ActivityStore(activities)
+    assert store.count_due(end=NOW) == 1
+
+    store.add(activities.iloc[[0]].assign(Status='Completed'))
+    assert store.count_due(end=NOW) == 0
+    result = store.query(NOW - timedelta(days=5), NOW + timedelta(days=5), as_of=NOW)
+    assert list(result['Activity ID']) == ['ACT-1', 'ACT-2']
+    assert not result['Overdue'].any()
+
+
+def test_empty_store():
+    store = ActivityStore()
+    assert store.query(NOW, NOW + timedelta(days=1)).empty
+    assert store.count_due() == 0
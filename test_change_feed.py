@@ -0,0 +1,146 @@
+import importlib.util
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from change_feed import ChangeFeed
+
+POSTED_AT = '2026-10-19T16:35:01.123456'
+
+
+def test_empty_feed_starts_at_zero(tmp_path):
+    feed = ChangeFeed(str(tmp_path / "feed.db"))
+    assert feed.latest_seq() == 0
+    assert feed.read_since(0) == []
+
+
+def test_cursor_only_returns_newer_changes(tmp_path):
+    feed = ChangeFeed(str(tmp_path / "feed.db"))
+    first = feed.append("kpi", {"name": "Revenue Growth", "current": "15.2%"})
+    second = feed.append("document", {"Document Name": "Document 1"})
+
+    assert [change["seq"] for change in feed.read_since(0)] == [first, second]
+    assert [change["seq"] for change in feed.read_since(first)] == [second]
+    assert feed.read_since(second) == []
+    assert feed.latest_seq() == second
+
+
+def test_topic_filter_and_limit(tmp_path):
+    feed = ChangeFeed(str(tmp_path / "feed.db"))
+    for i in range(5):
+        feed.append("kpi", {"i": i})
+        feed.append("document", {"i": i})
+
+    kpis = feed.read_since(0, ["kpi"])
+    assert [change["payload"]["i"] for change in kpis] == list(range(5))
+    assert all(change["topic"] == "kpi" for change in kpis)
+
+    page = feed.read_since(0, ["kpi"], limit=2)
+    assert [change["payload"]["i"] for change in page] == [0, 1]
+    rest = feed.read_since(page[-1]["seq"], ["kpi"])
+    assert [change["payload"]["i"] for change in rest] == [2, 3, 4]
+
+
+def test_payloads_round_trip_as_json(tmp_path):
+    feed = ChangeFeed(str(tmp_path / "feed.db"))
+    feed.append("document", [1, "two"])
+    change = feed.read_since(0)[0]
+    assert change["payload"] == [1, "two"]
+    assert change["posted_at"]
+
+
+def load_app_module(name, filename):
+    spec = importlib.util.spec_from_file_location(name, Path(__file__).with_name(filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def dashboard():
+    return load_app_module('atnv_2', 'atnv-2.py')
+
+
+@pytest.fixture
+def live_state(dashboard, tmp_path):
+    def make_state(feed):
+        documents = pd.DataFrame({
+            'Document Name': ['Document 0', 'Document 1'],
+            'Type': ['Invoice', 'Policy'],
+            'Created Date': pd.to_datetime(['2026-10-01', '2026-10-02']),
+            'Status': ['Draft', 'Approved'],
+            'Owner': ['John D.', 'Sarah M.'],
+        })
+        return dashboard.LiveFeedState(feed, {'Revenue Growth': {'current': '15.2%', 'delta': '2.3%'}}, documents)
+    return make_state
+
+
+def document_change(payload, seq=1):
+    return {'seq': seq, 'topic': 'document', 'payload': payload, 'posted_at': POSTED_AT}
+
+
+@pytest.mark.parametrize("payload", [
+    [1],
+    'Document 5',
+    {'Type': 'Invoice'},
+    {'Document Name': 5},
+    {'Document Name': 'Document 5', 'Created Date': 'not a date'},
+    {'Document Name': 'Document 5', 'Created Date': None},
+    {'Document Name': 'Document 5', 'Created Date': ['2026-10-19']},
+])
+def test_parse_document_change_rejects_malformed_payloads(live_state, tmp_path, payload):
+    state = live_state(ChangeFeed(str(tmp_path / "feed.db")))
+    assert state.parse_document_change(document_change(payload)) is None
+
+
+def test_parse_document_change_dates(live_state, tmp_path):
+    state = live_state(ChangeFeed(str(tmp_path / "feed.db")))
+
+    dated = state.parse_document_change(document_change({'Document Name': 'A', 'Created Date': '2026-10-19'}))
+    assert dated['Created Date'] == pd.Timestamp('2026-10-19')
+
+    fallback = state.parse_document_change(document_change({'Document Name': 'B', 'Type': ['Invoice']}))
+    assert fallback['Created Date'] == pd.Timestamp(POSTED_AT)
+    assert fallback['Type'] is None
+
+    aware = state.parse_document_change(
+        document_change({'Document Name': 'C', 'Created Date': '2026-10-19T10:00:00+02:00'})
+    )
+    assert aware['Created Date'] == pd.Timestamp('2026-10-19 08:00:00')
+    assert aware['Created Date'].tzinfo is None
+
+
+@pytest.mark.parametrize("payload", [
+    [1],
+    {'current': '1%'},
+    {'name': 'Revenue Growth'},
+    {'name': 'Revenue Growth', 'current': ['1%']},
+    {'name': 'Revenue Growth', 'current': '1%', 'delta': {'x': 1}},
+])
+def test_parse_kpi_change_rejects_malformed_payloads(live_state, tmp_path, payload):
+    state = live_state(ChangeFeed(str(tmp_path / "feed.db")))
+    assert state.parse_kpi_change({'seq': 1, 'topic': 'kpi', 'payload': payload}) is None
+
+
+def test_sync_replays_the_log_and_skips_bad_rows(live_state, tmp_path):
+    feed = ChangeFeed(str(tmp_path / "feed.db"))
+    feed.append('document', {'Document Name': 'Document 1', 'Created Date': '2026-10-19', 'Status': 'Under Review'})
+    feed.append('document', {'Document Name': 'Document 9'})
+    feed.append('document', [1])
+    feed.append('kpi', {'name': 'Revenue Growth'})
+    feed.append('kpi', {'name': 'Revenue Growth', 'current': '15.9%', 'delta': '0.7%'})
+
+    # Created after the changes were posted, as a session opened later would be
+    state = live_state(feed)
+    kpis, documents = state.sync()
+    assert state.cursor == feed.latest_seq()
+    assert kpis['Revenue Growth'] == {'current': '15.9%', 'delta': '0.7%'}
+    assert list(documents['Document Name']) == ['Document 0', 'Document 1', 'Document 9']
+    assert documents.set_index('Document Name').loc['Document 1', 'Status'] == 'Under Review'
+    assert str(documents['Created Date'].dtype).startswith('datetime64')
+
+    feed.append('document', {'Document Name': 'Document 10', 'Created Date': '2026-10-20T09:00:00'})
+    _, documents = state.sync()
+    assert 'Document 10' in set(documents['Document Name'])
+    assert state.cursor == feed.latest_seq()
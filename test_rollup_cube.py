@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from change_feed import ChangeFeed
+from rollup_cube import (
+    DIMENSIONS, GRAINS, PERIOD_CLOSE_TOPIC, PeriodCloseSync, RollupCube, generate_sample_transactions
+)
+
+
+@pytest.fixture(scope="module")
+def transactions():
+    np.random.seed(0)
+    return generate_sample_transactions(months=15)
+
+
+def by_month(transactions):
+    return transactions.groupby(transactions['Date'].dt.to_period('M'))
+
+
+def assert_cubes_equal(left, right):
+    for key in left.cuboids:
+        pdt.assert_frame_equal(left.cuboids[key], right.cuboids[key])
+
+
+def test_slice_matches_group_by(transactions):
+    cube = RollupCube()
+    cube.refresh(transactions)
+    filtered = transactions[transactions['Company'].isin(['Company 1', 'Company 2'])]
+    expected = filtered.groupby(
+        [filtered['Date'].dt.to_period('Q').dt.start_time.rename('Period'), 'Department']
+    )[['Revenue', 'Target', 'Margin']].sum().reset_index()
+
+    result = cube.slice('Quarter', by=['Department'], Company=['Company 1', 'Company 2'])
+    pdt.assert_frame_equal(result.drop(columns='Margin %'), expected)
+    assert (result['Margin %'] == (expected['Margin'] / expected['Revenue'] * 100).round(1)).all()
+
+
+def test_incremental_refresh_matches_full_refresh(transactions):
+    full = RollupCube()
+    full.refresh(transactions)
+
+    incremental = RollupCube()
+    for _, month in by_month(transactions):
+        incremental.refresh(month)
+    assert_cubes_equal(incremental, full)
+    assert len(incremental.loaded_periods) == 15
+
+
+def test_refresh_is_idempotent(transactions):
+    cube = RollupCube()
+    cube.refresh(transactions)
+    before = cube.slice('Year')
+
+    march = transactions[transactions['Date'].dt.to_period('M') == pd.Period('2024-03', 'M')]
+    cube.refresh(march)
+    cube.refresh(march)
+    pdt.assert_frame_equal(cube.slice('Year'), before)
+
+
+def test_correction_replaces_period(transactions):
+    corrected = transactions.copy()
+    may = corrected['Date'].dt.to_period('M') == pd.Period('2024-05', 'M')
+    corrected.loc[may, 'Revenue'] *= 2
+
+    cube = RollupCube()
+    cube.refresh(transactions)
+    cube.refresh(corrected[may])
+
+    expected = RollupCube()
+    expected.refresh(corrected)
+    assert_cubes_equal(cube, expected)
+
+
+@pytest.mark.parametrize("grain", list(GRAINS))
+def test_every_grain_and_drill_down_sums_to_total(transactions, grain):
+    cube = RollupCube()
+    cube.refresh(transactions)
+    total = transactions['Revenue'].sum()
+    assert cube.slice(grain)['Revenue'].sum() == pytest.approx(total)
+    for dim in DIMENSIONS:
+        assert cube.slice(grain, by=[dim])['Revenue'].sum() == pytest.approx(total)
+
+
+def test_empty_cube_slice():
+    result = RollupCube().slice('Month', by=['Product'])
+    assert result.empty
+    assert list(result.columns) == ['Period', 'Product', 'Revenue', 'Target', 'Margin', 'Margin %']
+
+
+def as_payload(transactions):
+    rows = transactions.assign(Date=transactions['Date'].dt.strftime('%Y-%m-%dT%H:%M:%S'))
+    return {'transactions': rows.to_dict('records')}
+
+
+def test_period_close_feed_refreshes_the_cube(transactions, tmp_path):
+    feed = ChangeFeed(str(tmp_path / "feed.db"))
+    cube = RollupCube()
+    cube.refresh(transactions)
+    period_close = PeriodCloseSync(cube, feed)
+
+    np.random.seed(1)
+    april = generate_sample_transactions(start='2025-04-01', months=1)
+    corrected = transactions.copy()
+    may = corrected['Date'].dt.to_period('M') == pd.Period('2024-05', 'M')
+    corrected.loc[may, 'Revenue'] *= 2
+
+    valid_row = as_payload(april.head(1))['transactions'][0]
+    for malformed in [
+        [1],
+        {'transactions': []},
+        {'transactions': [{**valid_row, 'Revenue': float('nan')}]},
+        {'transactions': [{**valid_row, 'Date': 'not a date'}]},
+        {'transactions': [{**valid_row, 'Company': None}]},
+        {'transactions': [valid_row, 'row']},
+    ]:
+        feed.append(PERIOD_CLOSE_TOPIC, malformed)
+    feed.append(PERIOD_CLOSE_TOPIC, as_payload(april))
+    feed.append(PERIOD_CLOSE_TOPIC, as_payload(corrected[may]))
+    feed.append(PERIOD_CLOSE_TOPIC, as_payload(april))
+
+    assert period_close.sync() is cube
+    assert period_close.cursor == feed.latest_seq()
+
+    expected = RollupCube()
+    expected.refresh(pd.concat([corrected, april]))
+    assert len(cube.loaded_periods) == 16
+    for grain in GRAINS:
+        pdt.assert_frame_equal(cube.slice(grain, by=['Department']), expected.slice(grain, by=['Department']))
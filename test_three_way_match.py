@@ -0,0 +1,184 @@
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from change_feed import ChangeFeed
+from three_way_match import EXCEPTION_STATUSES, MATCH_KEY, ThreeWayMatcher, generate_sample_documents
+
+
+def make_documents(num_lines=400, seed=0):
+    np.random.seed(seed)
+    return generate_sample_documents(['Vendor 1', 'Vendor 2', 'Vendor 3'], num_lines)
+
+
+def sorted_results(matcher):
+    return matcher.results.sort_values(MATCH_KEY, ignore_index=True)
+
+
+def test_match_statuses():
+    purchase_orders = pd.DataFrame({
+        'PO Number': ['PO1', 'PO1', 'PO2', 'PO3', 'PO4'],
+        'Line': [1, 2, 1, 1, 1],
+        'Vendor Name': ['A', 'A', 'B', 'B', 'C'],
+        'Quantity': [10, 5, 3, 4, 2],
+        'Unit Price': [2.0, 4.0, 10.0, 5.0, 1.0]
+    })
+    receipts = pd.DataFrame({
+        'PO Number': ['PO1', 'PO1', 'PO2', 'PO3', 'PO4'],
+        'Line': [1, 2, 1, 1, 1],
+        'Quantity Received': [10, 6, 1, 4, 2]
+    })
+    bills = pd.DataFrame({
+        'PO Number': ['PO1', 'PO2', 'PO3', 'PO9'],
+        'Line': [1, 1, 1, 1],
+        'Vendor Name': ['A', 'B', 'B', 'D'],
+        'Quantity Billed': [10, 3, 4, 1],
+        'Amount': [25.0, 30.0, 20.2, 5.0]
+    })
+    results = ThreeWayMatcher().match(purchase_orders, receipts, bills)
+    statuses = dict(zip(zip(results['PO Number'], results['Line']), results['Status']))
+    assert statuses == {
+        ('PO1', 1): 'Price Variance',
+        ('PO1', 2): 'Over Received',
+        ('PO2', 1): 'Billed Not Received',
+        ('PO3', 1): 'Matched',
+        ('PO4', 1): 'Awaiting Bill',
+        ('PO9', 1): 'No Purchase Order',
+    }
+
+
+def test_incremental_matches_full_rebuild():
+    purchase_orders, receipts, bills = make_documents()
+    late_receipts = receipts.sample(20, random_state=1)
+    late_bills = bills.sample(20, random_state=2).assign(Amount=lambda frame: frame['Amount'] * 1.1)
+    # Billed under a different vendor before its PO arrives; the PO vendor must win either way
+    orphan_bill = pd.DataFrame({
+        'PO Number': ['PO-9999'], 'Line': [1], 'Vendor Name': ['Vendor 7'],
+        'Quantity Billed': [2], 'Amount': [50.0]
+    })
+    late_po = pd.DataFrame({
+        'PO Number': ['PO-9999', 'PO-9998'], 'Line': [1, 1], 'Vendor Name': ['Vendor 9', 'Vendor 8'],
+        'Quantity': [2, 3], 'Unit Price': [25.0, 7.0]
+    })
+
+    incremental = ThreeWayMatcher()
+    incremental.match(purchase_orders.iloc[:200], receipts.iloc[:200], bills.iloc[:100])
+    incremental.add_documents(purchase_orders=purchase_orders.iloc[200:])
+    incremental.add_documents(receipts=receipts.iloc[200:], bills=bills.iloc[100:])
+    incremental.add_documents(receipts=late_receipts, bills=pd.concat([late_bills, orphan_bill]))
+    incremental.add_documents(purchase_orders=late_po)
+
+    full = ThreeWayMatcher()
+    full.match(
+        pd.concat([purchase_orders, late_po]),
+        pd.concat([receipts, late_receipts]),
+        pd.concat([bills, late_bills, orphan_bill])
+    )
+    pdt.assert_frame_equal(sorted_results(incremental), sorted_results(full), check_dtype=False)
+    pdt.assert_frame_equal(incremental.vendor_exceptions(), full.vendor_exceptions())
+
+    line = sorted_results(incremental).set_index(MATCH_KEY).loc[('PO-9999', 1)]
+    assert line['Vendor Name'] == 'Vendor 9'
+    assert line['Bill Vendor'] == 'Vendor 7'
+    assert line['Status'] == 'Vendor Mismatch'
+
+
+def test_vendor_exceptions_counts():
+    matcher = ThreeWayMatcher()
+    matcher.match(*make_documents())
+    results = matcher.results
+    summary = matcher.vendor_exceptions().set_index('Vendor Name')
+    assert summary['Open Lines'].sum() == (results['Status'] == 'Awaiting Bill').sum()
+    assert summary['Match Exceptions'].sum() == results['Status'].isin(EXCEPTION_STATUSES).sum()
+
+
+def test_add_documents_with_nothing_is_a_no_op():
+    matcher = ThreeWayMatcher()
+    matcher.add_documents()
+    assert matcher.results.empty
+    assert matcher.vendor_exceptions().empty
+
+
+def test_reposted_po_line_replaces_the_stored_line():
+    purchase_order = pd.DataFrame({
+        'PO Number': ['PO1'], 'Line': [1], 'Vendor Name': ['A'], 'Quantity': [2], 'Unit Price': [5.0]
+    })
+    receipt = pd.DataFrame({'PO Number': ['PO1'], 'Line': [1], 'Quantity Received': [2]})
+    bill = pd.DataFrame({
+        'PO Number': ['PO1'], 'Line': [1], 'Vendor Name': ['A'], 'Quantity Billed': [2], 'Amount': [10.0]
+    })
+    amended = purchase_order.assign(Quantity=3)
+
+    matcher = ThreeWayMatcher()
+    matcher.match(purchase_order, receipt, bill)
+    matcher.add_documents(purchase_orders=purchase_order)
+    assert matcher.results.loc[0, 'Quantity'] == 2
+    assert matcher.results.loc[0, 'Status'] == 'Matched'
+
+    matcher.add_documents(purchase_orders=amended)
+    full = ThreeWayMatcher()
+    full.match(pd.concat([purchase_order, purchase_order, amended]), receipt, bill)
+    pdt.assert_frame_equal(matcher.results, full.results, check_dtype=False)
+    assert matcher.results.loc[0, 'Quantity'] == 3
+
+
+def load_app_module(name, filename):
+    spec = importlib.util.spec_from_file_location(name, Path(__file__).with_name(filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def vendor_matching(tmp_path):
+    app = load_app_module('atnv_3', 'atnv-3.py')
+    np.random.seed(0)
+    return app.VendorMatching(ChangeFeed(str(tmp_path / 'feed.db')), generate_sample_documents(['Vendor 1']))
+
+
+def test_sync_skips_malformed_procurement_changes(vendor_matching):
+    feed = vendor_matching.feed
+    bill = {'PO Number': 'PO-9000', 'Line': 1, 'Vendor Name': 'Vendor 1', 'Quantity Billed': 1, 'Amount': 5.0}
+    for malformed in [
+        [bill],
+        {**bill, 'PO Number': ['PO-0001']},
+        {**bill, 'Line': '1'},
+        {**bill, 'Line': True},
+        {**bill, 'Vendor Name': None},
+        {**bill, 'Amount': float('nan')},
+        {**bill, 'Quantity Billed': float('inf')},
+        {**bill, 'Quantity Billed': False},
+        {key: value for key, value in bill.items() if key != 'Amount'},
+    ]:
+        feed.append('vendor_bill', malformed)
+    feed.append('vendor_bill', bill)
+    lines_before = len(vendor_matching.matcher.results)
+
+    results = vendor_matching.sync().results
+    assert vendor_matching.cursor == feed.latest_seq()
+    assert len(results) == lines_before + 1
+    added = results[results['PO Number'] == 'PO-9000']
+    assert list(added['Line']) == [1]
+    assert list(added['Status']) == ['No Purchase Order']
+
+
+def test_sync_advances_past_a_failing_batch(vendor_matching, monkeypatch):
+    feed = vendor_matching.feed
+    feed.append('goods_receipt', {'PO Number': 'PO-0000', 'Line': 1, 'Quantity Received': 1})
+
+    def fail(**documents):
+        raise ValueError("bad batch")
+
+    monkeypatch.setattr(vendor_matching.matcher, 'add_documents', fail)
+    vendor_matching.sync()
+    assert vendor_matching.cursor == feed.latest_seq()
+
+    monkeypatch.undo()
+    feed.append('goods_receipt', {'PO Number': 'PO-0000', 'Line': 1, 'Quantity Received': 1})
+    before = vendor_matching.matcher.lines.loc[('PO-0000', 1), 'Quantity Received']
+    vendor_matching.sync()
+    assert vendor_matching.matcher.lines.loc[('PO-0000', 1), 'Quantity Received'] == before + 1
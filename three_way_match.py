@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+MATCH_KEY = ['PO Number', 'Line']
+
+PO_COLUMNS = MATCH_KEY + ['Vendor Name', 'Quantity', 'Unit Price']
+RECEIPT_COLUMNS = MATCH_KEY + ['Quantity Received']
+BILL_COLUMNS = MATCH_KEY + ['Vendor Name', 'Quantity Billed', 'Amount']
+
+QUANTITY_COLUMNS = ['Quantity', 'Quantity Received', 'Quantity Billed', 'Amount']
+# Receipts and bills accumulate per line; a PO line is a single document and is replaced when re-posted
+ADDITIVE_COLUMNS = ['Quantity Received', 'Quantity Billed', 'Amount']
+LINE_COLUMNS = ['Vendor Name', 'Bill Vendor', 'Quantity', 'Unit Price', 'Quantity Received', 'Quantity Billed',
+                'Amount', 'Price Variance %', 'Status']
+
+EXCEPTION_STATUSES = ['No Purchase Order', 'Vendor Mismatch', 'Billed Not Received', 'Over Received',
+                      'Price Variance']
+
+class ThreeWayMatcher:
+    # Matched state is one row per PO line, indexed by MATCH_KEY. New documents are rolled up
+    # to their keys, added onto the existing rows in place and only those rows are re-checked.
+    def __init__(self, quantity_tolerance=0.0, price_tolerance=0.02):
+        self.quantity_tolerance = quantity_tolerance
+        self.price_tolerance = price_tolerance
+        self.lines = self._empty_lines()
+
+    @property
+    def results(self):
+        return self.lines.reset_index()
+
+    def match(self, purchase_orders, receipts, bills):
+        self.lines = self._empty_lines()
+        self.add_documents(purchase_orders, receipts, bills)
+        return self.results
+
+    def add_documents(self, purchase_orders=None, receipts=None, bills=None):
+        delta = self._aggregate(purchase_orders, receipts, bills)
+        if delta.empty:
+            return
+        if self.lines.empty:
+            self.lines = self._apply_rules(delta)
+            return
+
+        positions = self.lines.index.get_indexer(delta.index)
+        existing = positions >= 0
+        if existing.any():
+            # Receipts and bills against known lines are the common case: look up and rewrite only those rows
+            rows = positions[existing]
+            current = self.lines.iloc[rows]
+            updates = delta[existing]
+            merged = current[ADDITIVE_COLUMNS].to_numpy() + updates[ADDITIVE_COLUMNS].to_numpy()
+            current = current.assign(**dict(zip(ADDITIVE_COLUMNS, merged.T)))
+            # The PO vendor wins over a vendor taken from a bill that arrived before its PO
+            has_po = updates['Unit Price'].notna().to_numpy()
+            for column in ['Vendor Name', 'Quantity', 'Unit Price']:
+                current[column] = current[column].where(~has_po, updates[column].to_numpy())
+            current['Bill Vendor'] = current['Bill Vendor'].where(
+                current['Bill Vendor'].notna(), updates['Bill Vendor'].to_numpy()
+            )
+            current['Vendor Name'] = current['Vendor Name'].where(
+                current['Vendor Name'].notna(), current['Bill Vendor']
+            )
+            current = self._apply_rules(current)
+            for column in LINE_COLUMNS:
+                self.lines.iloc[rows, self.lines.columns.get_loc(column)] = current[column].to_numpy()
+        if not existing.all():
+            self.lines = pd.concat([self.lines, self._apply_rules(delta[~existing])])
+
+    def vendor_exceptions(self):
+        status = self.lines['Status']
+        summary = pd.DataFrame({
+            'Vendor Name': self.lines['Vendor Name'].to_numpy(),
+            'Open Lines': (status == 'Awaiting Bill').to_numpy(),
+            'Match Exceptions': status.isin(EXCEPTION_STATUSES).to_numpy()
+        }).groupby('Vendor Name').sum()
+        return summary.astype(int).reset_index()
+
+    def _empty_lines(self):
+        return pd.DataFrame(
+            {column: pd.Series(dtype=object if column in ('Vendor Name', 'Bill Vendor', 'Status') else float)
+             for column in LINE_COLUMNS},
+            index=pd.MultiIndex.from_arrays([[], []], names=MATCH_KEY)
+        )
+
+    def _aggregate(self, purchase_orders, receipts, bills):
+        frames = []
+        if purchase_orders is not None and len(purchase_orders):
+            frames.append(
+                purchase_orders[PO_COLUMNS].drop_duplicates(MATCH_KEY, keep='last').set_index(MATCH_KEY)
+            )
+        if receipts is not None and len(receipts):
+            frames.append(receipts[RECEIPT_COLUMNS].groupby(MATCH_KEY)[['Quantity Received']].sum())
+        if bills is not None and len(bills):
+            frames.append(bills[BILL_COLUMNS].groupby(MATCH_KEY).agg(
+                **{'Bill Vendor': ('Vendor Name', 'first'),
+                   'Quantity Billed': ('Quantity Billed', 'sum'),
+                   'Amount': ('Amount', 'sum')}
+            ))
+        if not frames:
+            return self._empty_lines()
+
+        delta = pd.concat(frames, axis=1)
+        delta = delta.reindex(columns=LINE_COLUMNS)
+        delta['Bill Vendor'] = delta['Bill Vendor'].astype(object)
+        delta['Vendor Name'] = delta['Vendor Name'].fillna(delta['Bill Vendor']).astype(object)
+        delta['Unit Price'] = delta['Unit Price'].astype(float)
+        for column in QUANTITY_COLUMNS:
+            delta[column] = delta[column].astype(float).fillna(0.0)
+        return delta
+
+    def _apply_rules(self, lines):
+        ordered = lines['Quantity'].to_numpy(dtype=float)
+        receipt_qty = lines['Quantity Received'].to_numpy(dtype=float)
+        billed_qty = lines['Quantity Billed'].to_numpy(dtype=float)
+        unit_price = lines['Unit Price'].to_numpy(dtype=float)
+        bill_vendor = lines['Bill Vendor']
+        vendor_mismatch = (bill_vendor.notna() & (bill_vendor != lines['Vendor Name'])).to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            billed_price = lines['Amount'].to_numpy(dtype=float) / billed_qty
+            price_variance = (billed_price - unit_price) / unit_price
+
+        lines = lines.copy()
+        lines['Price Variance %'] = np.where(billed_qty > 0, price_variance * 100, np.nan).round(2)
+        lines['Status'] = np.select(
+            [
+                np.isnan(unit_price),
+                vendor_mismatch,
+                billed_qty > receipt_qty * (1 + self.quantity_tolerance),
+                receipt_qty > ordered * (1 + self.quantity_tolerance),
+                (billed_qty > 0) & (np.abs(price_variance) > self.price_tolerance),
+                billed_qty == 0,
+            ],
+            ['No Purchase Order', 'Vendor Mismatch', 'Billed Not Received', 'Over Received', 'Price Variance',
+             'Awaiting Bill'],
+            default='Matched'
+        ).astype(object)
+        return lines
+
+def generate_sample_documents(vendor_names, num_lines=200):
+    purchase_orders = pd.DataFrame({
+        'PO Number': [f'PO-{i // 4:04d}' for i in range(num_lines)],
+        'Line': [i % 4 + 1 for i in range(num_lines)],
+        'Vendor Name': np.repeat(np.random.choice(vendor_names, num_lines // 4 + 1), 4)[:num_lines],
+        'Quantity': np.random.randint(1, 50, num_lines),
+        'Unit Price': np.random.uniform(10, 500, num_lines).round(2)
+    })
+    receipts = purchase_orders[MATCH_KEY].assign(**{
+        'Quantity Received': (purchase_orders['Quantity'] * np.random.choice([0, 1, 1, 1, 1.1], num_lines)).round()
+    })
+    billed = purchase_orders.sample(frac=0.8)
+    bills = billed[MATCH_KEY + ['Vendor Name']].assign(**{
+        'Quantity Billed': billed['Quantity'],
+        'Amount': (billed['Quantity'] * billed['Unit Price'] * np.random.uniform(0.97, 1.03, len(billed))).round(2)
+    })
+    return purchase_orders, receipts, bills